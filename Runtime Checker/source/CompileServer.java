@@ -0,0 +1,60 @@
+import java.io.BufferedOutputStream;
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.OutputStreamWriter;
+import java.io.PrintStream;
+import java.io.Writer;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import javax.tools.JavaCompiler;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+
+// Long-lived javac used by runtime_checker.py so the JVM boots once per session.
+// Each request is "<output dir>\t<source file>" on one line; each reply is
+// "OK <n>" or "ERR <n>" followed by n bytes of UTF-8 compiler diagnostics.
+public class CompileServer {
+    public static void main(String[] args) throws IOException {
+        PrintStream out = new PrintStream(new BufferedOutputStream(System.out), false, "UTF-8");
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (compiler == null) {
+            out.print("UNAVAILABLE\n");
+            out.flush();
+            return;
+        }
+        out.print("READY\n");
+        out.flush();
+
+        BufferedReader in = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        String line;
+        while ((line = in.readLine()) != null) {
+            int tab = line.indexOf('\t');
+            if (tab < 0) {
+                continue;
+            }
+            String outputDir = line.substring(0, tab);
+            String source = line.substring(tab + 1);
+
+            ByteArrayOutputStream diagnostics = new ByteArrayOutputStream();
+            // compiler.run() would write in the platform charset, the client always decodes UTF-8
+            Writer writer = new OutputStreamWriter(diagnostics, StandardCharsets.UTF_8);
+            boolean succeeded;
+            try (StandardJavaFileManager fileManager = compiler.getStandardFileManager(null, null, null)) {
+                succeeded = compiler.getTask(
+                    writer, fileManager, null, Arrays.asList("-d", outputDir), null,
+                    fileManager.getJavaFileObjects(source)
+                ).call();
+            } catch (RuntimeException e) {
+                writer.write(e + "\n");
+                succeeded = false;
+            }
+            writer.flush();
+            byte[] data = diagnostics.toByteArray();
+            out.print((succeeded ? "OK " : "ERR ") + data.length + "\n");
+            out.write(data);
+            out.flush();
+        }
+    }
+}
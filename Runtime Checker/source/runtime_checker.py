@@ -1,12 +1,35 @@
 import subprocess
 import time
 import os
-import tempfile
 import shutil
+import queue
+import atexit
+import tempfile
+import threading
+import itertools
+import functools
+import io
+import hashlib
+import mmap
+import re
+import sys
+import argparse
+from dataclasses import dataclass
+from typing import Optional
+# concurrent.futures is imported where it is used: only --all needs it, and it
+# noticeably slows down start-up
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import termios
+    import tty
 
 # --- Configuration ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DEST_FILE = "dest.txt"
 CODE_FOLDER_NAME = "check_code"
+_CODE_FOLDER_NAME_CI = os.path.normcase(CODE_FOLDER_NAME.lower())
 SUPPORTED_EXTENSIONS = {
     ".py": "python",
     ".c": "c",
@@ -15,13 +38,544 @@ SUPPORTED_EXTENSIONS = {
     ".cc": "cpp",
     ".java": "java"
 }
+JAVA_COMPILE_SERVER_SOURCE = "CompileServer.java"
+# Build artifacts go to a per-session directory under this path, or the system temp dir
+TEMP_DIR_ENV_VAR = "RUNTIME_CHECKER_TMPDIR"
+# Compiled programs are kept here, keyed by a hash of the source, compiler and build
+# options. Only the BUILD_CACHE_MAX_ENTRIES most recently used builds are kept.
+CACHE_DIR_ENV_VAR = "RUNTIME_CHECKER_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "runtime_checker")
+BUILD_CACHE_MAX_ENTRIES = 256
+# Streamed output is read in chunks of up to this size, and only the last
+# OUTPUT_TAIL_BYTES of it are kept for the results
+STREAM_CHUNK_SIZE = 65536
+OUTPUT_TAIL_BYTES = 1024 * 1024
+# Batch runs keep at most this many programs running at once, more than that
+# just thrashes the scheduler and the filesystem
+MAX_JOBS_ENV_VAR = "RUNTIME_CHECKER_MAX_JOBS"
+DEFAULT_MAX_JOBS = 16
+# Sources at least this large are memory-mapped rather than read when hashed for the build cache
+MMAP_HASH_THRESHOLD = 64 * 1024
+# Files at least this large are never read just to check for whitespace-only content
+WHITESPACE_CHECK_LIMIT = 4096
+# Input at least this large is handed to the program in an in-memory file (Linux
+# memfd) rather than fed through a pipe one pipe buffer at a time
+MEMFD_INPUT_THRESHOLD = 64 * 1024
+
+@dataclass(frozen=True)
+class Toolchain:
+    python: Optional[str]
+    gcc: Optional[str]
+    gpp: Optional[str]
+    javac: Optional[str]
+    java: Optional[str]
+
+    @classmethod
+    def detect(cls):
+        return cls(
+            python=shutil.which("python3") or shutil.which("python"),
+            gcc=shutil.which("gcc"),
+            gpp=shutil.which("g++"),
+            javac=shutil.which("javac"),
+            java=shutil.which("java")
+        )
+
+    def compiler_for(self, language):
+        return {"c": self.gcc, "cpp": self.gpp, "java": self.javac}[language]
+
+    def summary(self):
+        tools = [
+            ("python", self.python),
+            ("gcc", self.gcc),
+            ("g++", self.gpp),
+            ("javac", self.javac),
+            ("java", self.java)
+        ]
+        return "Detected: " + ", ".join(f"{name}={path or 'missing'}" for name, path in tools)
+
+class _Printer:
+    def __init__(self):
+        self.buffer = io.StringIO()
+
+    def print(self, *args, sep=" ", end="\n"):
+        print(*args, sep=sep, end=end, file=self.buffer)
+
+    def flush(self):
+        text = self.buffer.getvalue()
+        if text:
+            self.buffer.seek(0)
+            self.buffer.truncate()
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+_OUT = _Printer()
+atexit.register(_OUT.flush)
+
+def _prompt(text=""):
+    _OUT.flush()
+    return input(text)
+
+def _getch():
+    if os.name == "nt":
+        return msvcrt.getwch()
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        return os.read(fd, 1).decode('utf-8', errors='replace')
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+def _case_variants(text):
+    return {"".join(chars) for chars in itertools.product(*({c.lower(), c.upper()} for c in text))}
+
+# Accepted answers in every casing, so replies are matched without lowercasing them
+_YES = frozenset(_case_variants("yes") | _case_variants("y"))
+
+# With the terminal in cbreak mode Ctrl-D (Ctrl-Z on Windows) arrives as a character
+# rather than as end of input
+_EOF_KEYS = frozenset({"", "\x04", "\x1a"})
+
+def _read_choice(text):
+    if not sys.stdin.isatty():
+        return _prompt(text).strip()
+    _OUT.print(text, end="")
+    _OUT.flush()
+    key = _getch()
+    if key in _EOF_KEYS:
+        _OUT.print()
+        raise EOFError
+    _OUT.print(key)
+    return key
+
+# Each action takes whether there is a file to re-run and returns the next value
+# of rerun, or None when the choice can't be taken
+def _quit_action(can_rerun):
+    _OUT.print("Exiting..... Exited")
+    exit()
+
+def _rerun_action(can_rerun):
+    return True if can_rerun else None
+
+def _new_file_action(can_rerun):
+    _OUT.print("\n--- Preparing for next code check ---")
+    return False
+
+_NEXT_ACTIONS = {
+    variant: action
+    for key, action in (("q", _quit_action), ("r", _rerun_action), ("n", _new_file_action))
+    for variant in _case_variants(key)
+}
+
+_TOOLCHAIN = None
+
+def get_toolchain():
+    global _TOOLCHAIN
+    if _TOOLCHAIN is None:
+        _TOOLCHAIN = Toolchain.detect()
+    return _TOOLCHAIN
+
+def warm_up():
+    toolchain = get_toolchain()
+    _OUT.print(toolchain.summary())
+    return toolchain
+
+_COMPILERS = {
+    "c": "gcc",
+    "cpp": "g++",
+    "java": "javac"
+}
+
+class _JavaCompileServer:
+    def __init__(self):
+        self.process = None
+        self.server_dir = None
+        self.unavailable = False
+        self.lock = threading.Lock()
+
+    def _build(self, time_limit):
+        # The server itself is built once and then served from the build cache, so a
+        # session only pays for the JVM boot rather than a full javac run on top of it
+        javac = get_toolchain().javac
+        source = os.path.join(SCRIPT_DIR, JAVA_COMPILE_SERVER_SOURCE)
+        cached_dir = _BUILD_CACHE.entry_path(source, javac, "CompileServer")
+        if cached_dir is not None and os.path.isdir(cached_dir):
+            _BUILD_CACHE.mark_used(cached_dir)
+            return cached_dir
+        if self.server_dir is None:
+            self.server_dir = os.path.join(_get_session_temp_dir(), "compile_server")
+            os.makedirs(self.server_dir, exist_ok=True)
+        build = subprocess.run(
+            [javac, "-d", self.server_dir, source],
+            capture_output=True,
+            timeout=time_limit
+        )
+        if build.returncode != 0:
+            return None
+        if cached_dir is not None and _BUILD_CACHE.store(self.server_dir, cached_dir):
+            return cached_dir
+        return self.server_dir
+
+    def _start(self, time_limit):
+        class_dir = self._build(time_limit)
+        if class_dir is None:
+            return False
+        self.process = subprocess.Popen(
+            [get_toolchain().java, "-cp", class_dir, "CompileServer"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=-1
+        )
+        ready = _run_with_timeout(self.process.stdout.readline, time_limit)
+        return ready == [b"READY\n"]
+
+    @staticmethod
+    def _exchange(process, request):
+        process.stdin.write(request)
+        process.stdin.flush()
+        header = process.stdout.readline().split()
+        diagnostics = process.stdout.read(int(header[1]))
+        return header[0] == b"OK", diagnostics
+
+    def compile(self, src, out, time_limit):
+        with self.lock:
+            if self.unavailable:
+                return None
+            if self.process is None:
+                try:
+                    started = self._start(time_limit)
+                except (OSError, subprocess.TimeoutExpired):
+                    started = False
+                if not started:
+                    self.stop()
+                    self.unavailable = True
+                    return None
+
+            request = f"{out}\t{src}\n".encode('utf-8')
+            # A timed-out exchange keeps running in its thread after stop(), so it must
+            # only ever touch the process it started with, never a restarted one
+            process = self.process
+            reply = _run_with_timeout(lambda: self._exchange(process, request), time_limit)
+            if not reply:
+                self.stop()
+                raise subprocess.TimeoutExpired([JAVA_COMPILE_SERVER_SOURCE, src], time_limit)
+            if reply[0] is None:
+                self.stop()
+                self.unavailable = True
+                return None
+
+            succeeded, diagnostics = reply[0]
+            return subprocess.CompletedProcess(
+                [JAVA_COMPILE_SERVER_SOURCE, "-d", out, src],
+                0 if succeeded else 1,
+                "",
+                diagnostics.decode('utf-8', errors='replace')
+            )
+
+    def stop(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+
+def _run_with_timeout(func, timeout):
+    # Returns [result] on completion, [None] if func raised, [] on timeout.
+    outcome = []
+
+    def target():
+        try:
+            outcome.append(func())
+        except (OSError, ValueError, IndexError):
+            outcome.append(None)
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    return outcome
+
+_JAVA_COMPILE_SERVER = _JavaCompileServer()
+
+def _stop_java_compile_server():
+    _JAVA_COMPILE_SERVER.stop()
+
+atexit.register(_stop_java_compile_server)
+
+_COMPILE_FLAGS = {
+    "c": ["-pipe"],
+    "cpp": ["-pipe", "-std=c++17"]
+}
+
+def _compile_flags(language, optimize):
+    return _COMPILE_FLAGS[language] + (["-O2"] if optimize else [])
+
+def _compile(language, src, out, time_limit, optimize=True, dep_file=None):
+    compiler = get_toolchain().compiler_for(language)
+    if language == "java":
+        compile_process = _JAVA_COMPILE_SERVER.compile(src, out, time_limit)
+        if compile_process is not None:
+            return compile_process
+        compile_command = [compiler, "-d", out, src]
+    else:
+        compile_command = [compiler] + _compile_flags(language, optimize) + [src, "-o", out]
+        if dep_file is not None:
+            # List every non-system header the build reads, for the build cache
+            compile_command += ["-MMD", "-MF", dep_file]
+    return subprocess.run(
+        compile_command,
+        capture_output=True,
+        text=True,
+        timeout=time_limit
+    )
+
+def _read_dep_file(dep_path):
+    # A make rule, "target: dep dep \", with spaces, '#' and '$' in names escaped
+    with open(dep_path, 'rb') as f:
+        rule = os.fsdecode(f.read()).replace("\\\n", " ").replace("\\\r\n", " ")
+    _, _, deps = rule.partition(": ")
+    return [
+        os.path.abspath(re.sub(r"\\([ #])", r"\1", dep).replace("$$", "$"))
+        for dep in re.split(r"(?<!\\)\s+", deps)
+        if dep
+    ]
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+_SESSION_TEMP_DIR = None
+
+def _get_session_temp_dir():
+    global _SESSION_TEMP_DIR
+    if _SESSION_TEMP_DIR is None:
+        dir_name = f"runtime_checker_{os.getpid()}"
+        override = os.environ.get(TEMP_DIR_ENV_VAR)
+        session_dir = os.path.join(override or tempfile.gettempdir(), dir_name)
+        try:
+            os.makedirs(session_dir, exist_ok=True)
+        except OSError:
+            if not override:
+                raise
+            # An unusable override shouldn't take the whole checker down with it
+            session_dir = os.path.join(tempfile.gettempdir(), dir_name)
+            os.makedirs(session_dir, exist_ok=True)
+        _SESSION_TEMP_DIR = session_dir
+    return _SESSION_TEMP_DIR
+
+def _remove_session_temp_dir():
+    if _SESSION_TEMP_DIR is not None:
+        shutil.rmtree(_SESSION_TEMP_DIR, ignore_errors=True)
+
+atexit.register(_remove_session_temp_dir)
+
+class _Slot:
+    def __init__(self, base_dir, index):
+        self.exec_path = os.path.join(base_dir, f"slot_{index}.out")
+        self.dep_path = os.path.join(base_dir, f"slot_{index}.d")
+        self.java_dir = os.path.join(base_dir, f"java_slot_{index}")
+        self.java_dir_ready = False
+
+    def get_java_dir(self):
+        if not self.java_dir_ready:
+            os.makedirs(self.java_dir, exist_ok=True)
+            self.java_dir_ready = True
+        return self.java_dir
+
+    def clear(self):
+        _remove_file(self.exec_path)
+        _remove_file(self.dep_path)
+        if self.java_dir_ready:
+            for entry in os.scandir(self.java_dir):
+                if entry.name.endswith(".class"):
+                    _remove_file(entry.path)
+
+class _SlotPool:
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.indexes = itertools.count()
+        self.free = queue.Queue()
+
+    def acquire(self):
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            return _Slot(self.base_dir, next(self.indexes))
+
+    def release(self, slot):
+        slot.clear()
+        self.free.put(slot)
+
+class _BuildCache:
+    # Next to an entry, the digest and path of every file its build read
+    DEPENDENCIES_SUFFIX = ".deps"
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.usable = None
+        self.digests = {}
+        self.tool_fingerprints = {}
+
+    def _tool_fingerprint(self, tool_path):
+        # Where the tool really lives and when it was installed, so upgrading a
+        # compiler stops builds from the old one being reused
+        fingerprint = self.tool_fingerprints.get(tool_path)
+        if fingerprint is None:
+            real_path = os.path.realpath(tool_path)
+            try:
+                tool_stat = os.stat(real_path)
+                fingerprint = f"{real_path}:{tool_stat.st_mtime_ns}:{tool_stat.st_size}"
+            except OSError:
+                fingerprint = real_path
+            self.tool_fingerprints[tool_path] = fingerprint
+        return fingerprint
+
+    def _source_digest(self, file_path):
+        file_stat = os.stat(file_path)
+        cached = self.digests.get(file_path)
+        if cached is not None and cached[0] == (file_stat.st_mtime_ns, file_stat.st_size):
+            return cached[1]
+        with open(file_path, 'rb') as f:
+            if file_stat.st_size >= MMAP_HASH_THRESHOLD:
+                # Hash large sources straight from the page cache instead of copying them in
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    digest = hashlib.blake2b(mapped).hexdigest()
+            else:
+                digest = hashlib.blake2b(f.read()).hexdigest()
+        self.digests[file_path] = ((file_stat.st_mtime_ns, file_stat.st_size), digest)
+        return digest
+
+    def entry_path(self, file_path, tool, *build_args):
+        if self.usable is None:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                self.usable = True
+            except OSError:
+                self.usable = False
+        if not self.usable:
+            return None
+        try:
+            source_digest = self._source_digest(file_path)
+        except (OSError, ValueError):
+            return None
+        key = "\0".join((source_digest, tool, self._tool_fingerprint(tool)) + build_args)
+        return os.path.join(self.cache_dir, hashlib.blake2b(key.encode('utf-8'), digest_size=20).hexdigest())
+
+    def dependencies_current(self, entry_path):
+        try:
+            with open(entry_path + self.DEPENDENCIES_SUFFIX, encoding='utf-8', errors='surrogateescape') as f:
+                records = f.read().splitlines()
+        except OSError:
+            return False
+        for record in records:
+            digest, _, dep_path = record.partition("\t")
+            try:
+                if self._source_digest(dep_path) != digest:
+                    return False
+            except (OSError, ValueError):
+                return False
+        return True
+
+    def mark_used(self, entry_path):
+        # Eviction drops the entries with the oldest mtime first
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+
+    def _store_dependencies(self, entry_path, dependencies):
+        records = "".join(f"{self._source_digest(dep_path)}\t{dep_path}\n" for dep_path in dependencies)
+        staging_fd, staging_path = tempfile.mkstemp(dir=self.cache_dir)
+        try:
+            with os.fdopen(staging_fd, 'w', encoding='utf-8', errors='surrogateescape') as f:
+                f.write(records)
+            os.replace(staging_path, entry_path + self.DEPENDENCIES_SUFFIX)
+        except OSError:
+            _remove_file(staging_path)
+            raise
+
+    def _evict(self):
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as scan:
+                for entry in scan:
+                    if entry.name.endswith(self.DEPENDENCIES_SUFFIX):
+                        continue
+                    try:
+                        entries.append((entry.stat(follow_symlinks=False).st_mtime_ns, entry.path))
+                    except OSError:
+                        pass
+        except OSError:
+            return
+        if len(entries) <= BUILD_CACHE_MAX_ENTRIES:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - BUILD_CACHE_MAX_ENTRIES]:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                _remove_file(path)
+            _remove_file(path + self.DEPENDENCIES_SUFFIX)
+
+    def store(self, built_path, entry_path, dependencies=None):
+        # Copy next to the entry, then rename, so a half-written entry is never visible.
+        # The program goes in before its dependency list: a reader that catches the new
+        # program with the old list sees digests that no longer match and rebuilds.
+        staging_path = None
+        try:
+            if os.path.isdir(built_path):
+                staging_path = tempfile.mkdtemp(dir=self.cache_dir)
+                shutil.copytree(built_path, staging_path, dirs_exist_ok=True)
+            else:
+                staging_fd, staging_path = tempfile.mkstemp(dir=self.cache_dir)
+                os.close(staging_fd)
+                shutil.copy2(built_path, staging_path)
+            os.replace(staging_path, entry_path)
+            staging_path = None
+            if dependencies is not None:
+                self._store_dependencies(entry_path, dependencies)
+        except (OSError, ValueError):
+            if staging_path is None:
+                pass
+            elif os.path.isdir(staging_path):
+                shutil.rmtree(staging_path, ignore_errors=True)
+            else:
+                _remove_file(staging_path)
+            return False
+        self._evict()
+        return True
+
+_BUILD_CACHE = _BuildCache(os.environ.get(CACHE_DIR_ENV_VAR) or DEFAULT_CACHE_DIR)
+
+_SLOT_POOL = None
+
+def _get_slot_pool():
+    global _SLOT_POOL
+    if _SLOT_POOL is None:
+        _SLOT_POOL = _SlotPool(_get_session_temp_dir())
+    return _SLOT_POOL
+
+def _reset_after_fork():
+    # A forked child (an --all pool worker) starts its own session directory, slots
+    # and compile server instead of sharing the parent's paths and pipes
+    global _SESSION_TEMP_DIR, _SLOT_POOL, _JAVA_COMPILE_SERVER
+    _SESSION_TEMP_DIR = None
+    _SLOT_POOL = None
+    _JAVA_COMPILE_SERVER = _JavaCompileServer()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def _is_code_folder_name(path):
+    return os.path.normcase(os.path.basename(path)) == _CODE_FOLDER_NAME_CI
 
 def get_code_folder_path():
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    dest_file_path = os.path.join(script_dir, DEST_FILE)
+    dest_file_path = os.path.join(SCRIPT_DIR, DEST_FILE)
     code_folder_path = None
 
-    default_code_folder_path = os.path.join(script_dir, CODE_FOLDER_NAME)
+    default_code_folder_path = os.path.join(SCRIPT_DIR, CODE_FOLDER_NAME)
 
     stored_path_from_file = None
     if os.path.exists(dest_file_path):
@@ -30,294 +584,534 @@ def get_code_folder_path():
                 stored_path_from_file = f.read().strip()
             if stored_path_from_file:
                 if (os.path.isdir(stored_path_from_file) or not os.path.exists(stored_path_from_file)) and \
-                   os.path.basename(stored_path_from_file).lower() == CODE_FOLDER_NAME:
+                   _is_code_folder_name(stored_path_from_file):
                     code_folder_path = stored_path_from_file
-                    print(f"Using custom code folder from '{DEST_FILE}': '{code_folder_path}'")
+                    _OUT.print(f"Using custom code folder from '{DEST_FILE}': '{code_folder_path}'")
                 else:
-                    print(f"Stored path '{stored_path_from_file}' in '{DEST_FILE}' is invalid or not named '{CODE_FOLDER_NAME}'.")
+                    _OUT.print(f"Stored path '{stored_path_from_file}' in '{DEST_FILE}' is invalid or not named '{CODE_FOLDER_NAME}'.")
             else:
-                print(f"'{DEST_FILE}' is empty.")
+                _OUT.print(f"'{DEST_FILE}' is empty.")
         except Exception as e:
-            print(f"Warning: Could not read '{DEST_FILE}': {e}. Will prompt for a new path.")
+            _OUT.print(f"Warning: Could not read '{DEST_FILE}': {e}. Will prompt for a new path.")
     else:
-        print(f"'{DEST_FILE}' not found. Defaulting to '{default_code_folder_path}'.")
+        _OUT.print(f"'{DEST_FILE}' not found. Defaulting to '{default_code_folder_path}'.")
         code_folder_path = default_code_folder_path
 
     while code_folder_path is None:
-        user_input = input(f"Please enter the full path to your '{CODE_FOLDER_NAME}' folder: ").strip()
+        user_input = _prompt(f"Please enter the full path to your '{CODE_FOLDER_NAME}' folder: ").strip()
         if not user_input:
-            print("Path cannot be empty. Please try again.")
+            _OUT.print("Path cannot be empty. Please try again.")
             continue
 
-        user_input = os.path.abspath(user_input)
+        if os.path.isabs(user_input):
+            user_input = os.path.normpath(user_input)
+        else:
+            user_input = os.path.abspath(user_input)
 
         if (os.path.isdir(user_input) or not os.path.exists(user_input)) and \
-           os.path.basename(user_input).lower() == CODE_FOLDER_NAME:
+           _is_code_folder_name(user_input):
             code_folder_path = user_input
         else:
-            print(f"Error: '{user_input}' is not a valid directory path or not named '{CODE_FOLDER_NAME}'. Please try again.")
+            _OUT.print(f"Error: '{user_input}' is not a valid directory path or not named '{CODE_FOLDER_NAME}'. Please try again.")
 
     try:
         os.makedirs(code_folder_path, exist_ok=True)
-        print(f"Ensuring '{CODE_FOLDER_NAME}' folder exists at: '{code_folder_path}'")
+        _OUT.print(f"Ensuring '{CODE_FOLDER_NAME}' folder exists at: '{code_folder_path}'")
     except Exception as e:
-        print(f"Error: Could not create '{CODE_FOLDER_NAME}' folder at '{code_folder_path}': {e}")
+        _OUT.print(f"Error: Could not create '{CODE_FOLDER_NAME}' folder at '{code_folder_path}': {e}")
+        _OUT.flush()
         return None
 
-    try:
-        with open(dest_file_path, 'w') as f:
-            f.write(code_folder_path)
-        print(f"Updated '{DEST_FILE}' with the current folder path.")
-    except Exception as e:
-        print(f"Warning: Could not save path to '{DEST_FILE}': {e}")
+    if code_folder_path != stored_path_from_file:
+        try:
+            with open(dest_file_path, 'w') as f:
+                f.write(code_folder_path)
+            _OUT.print(f"Updated '{DEST_FILE}' with the current folder path.")
+        except Exception as e:
+            _OUT.print(f"Warning: Could not save path to '{DEST_FILE}': {e}")
 
+    _OUT.flush()
     return code_folder_path
 
+# Every casing of every supported extension, so filenames are matched by slicing
+# their tail without lowercasing or splitting them.
+_LANGUAGE_BY_TAIL = {
+    variant: language
+    for extension, language in SUPPORTED_EXTENSIONS.items()
+    for variant in _case_variants(extension)
+}
+_TAIL_LENGTHS = sorted({len(extension) for extension in SUPPORTED_EXTENSIONS}, reverse=True)
+
+def _classify_filename(filename):
+    for length in _TAIL_LENGTHS:
+        language = _LANGUAGE_BY_TAIL.get(filename[-length:])
+        if language is not None:
+            # A bare '.py' is a dotfile with no extension, as with os.path.splitext
+            return language if len(filename) > length else None
+    return None
+
+_CAN_PREFETCH = hasattr(os, "posix_fadvise")
+
+def prefetch_file(file_path):
+    # Ask the kernel to start reading the source into the page cache while the user
+    # is still answering prompts, so the compiler or interpreter does not hit a cold read
+    if not _CAN_PREFETCH:
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+_LISTING_CACHE = {}
+
+def list_code_files(code_folder_path):
+    mtime_ns = os.stat(code_folder_path).st_mtime_ns
+    cached = _LISTING_CACHE.get(code_folder_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    code_files = {}
+    inodes = {}
+    with os.scandir(code_folder_path) as entries:
+        for entry in entries:
+            if entry.is_file() and _classify_filename(entry.name) is not None:
+                code_files[entry.name] = entry.path
+                if _CAN_PREFETCH:
+                    inodes[entry.path] = entry.inode()
+
+    # Warm the page cache for the whole folder in one pass, in inode order so
+    # neighbouring files are requested together
+    for file_path in sorted(inodes, key=inodes.get):
+        prefetch_file(file_path)
+
+    _LISTING_CACHE[code_folder_path] = (mtime_ns, code_files)
+    return code_files
+
 def get_file_to_run(code_folder_path):
-    supported_files = []
-    for filename in os.listdir(code_folder_path):
-        file_path = os.path.join(code_folder_path, filename)
-        if os.path.isfile(file_path):
-            file_extension = os.path.splitext(filename)[1].lower()
-            if file_extension in SUPPORTED_EXTENSIONS:
-                supported_files.append(filename)
+    supported_files = list_code_files(code_folder_path)
 
     if not supported_files:
-        print(f"Error: No supported code files found in '{code_folder_path}'.")
-        print("Please place .py, .c, .cpp, or .java files inside this folder.")
+        _OUT.print(f"Error: No supported code files found in '{code_folder_path}'.")
+        _OUT.print("Please place .py, .c, .cpp, or .java files inside this folder.")
         return None
 
-    print(f"\nFound the following files in '{code_folder_path}':")
+    _OUT.print(f"\nFound the following files in '{code_folder_path}':")
     for i, filename in enumerate(supported_files):
-        print(f"  {i + 1}. {filename}")
+        _OUT.print(f"  {i + 1}. {filename}")
 
-    selected_file_name = None
-    while selected_file_name is None:
-        user_input = input("Enter the name of the file you want to check (e.g., my_code.py): ").strip()
+    selected_file_path = None
+    while selected_file_path is None:
+        user_input = _prompt("Enter the name of the file you want to check (e.g., my_code.py): ").strip()
         if not user_input:
-            print("File name cannot be empty. Please try again.")
+            _OUT.print("File name cannot be empty. Please try again.")
             continue
 
-        if user_input in supported_files:
-            selected_file_name = user_input
-        else:
-            print(f"Error: '{user_input}' not found or not a supported code file in the list. Please try again.")
+        selected_file_path = supported_files.get(user_input)
+        if selected_file_path is None:
+            _OUT.print(f"Error: '{user_input}' not found or not a supported code file in the list. Please try again.")
+
+    return selected_file_path
+
+
+def _handle_python(file_path, slot, time_limit, optimize):
+    python_exec = get_toolchain().python
+    if python_exec is None:
+        return None, ("Runtime Error", "Error: Neither 'python3' nor 'python' command found. Please ensure Python is installed and in your system's PATH.")
+    return [python_exec, file_path], None
+
+def _handle_c_like(file_path, slot, time_limit, optimize, language):
+    compiler_name = _COMPILERS[language]
+    compiler = get_toolchain().compiler_for(language)
+    if compiler is None:
+        return None, ("Runtime Error", f"Error: '{compiler_name}' command not found. Please ensure it is installed and in your system's PATH.")
+    cached_exec = _BUILD_CACHE.entry_path(file_path, compiler, *_compile_flags(language, optimize))
+    if cached_exec is not None and os.path.isfile(cached_exec) and _BUILD_CACHE.dependencies_current(cached_exec):
+        _BUILD_CACHE.mark_used(cached_exec)
+        return [cached_exec], None
+
+    dep_file = slot.dep_path if cached_exec is not None else None
+    compile_process = _compile(language, file_path, slot.exec_path, time_limit, optimize, dep_file)
+    if compile_process.returncode != 0:
+        return None, ("Compilation Error", compile_process.stderr)
+    if cached_exec is not None:
+        try:
+            dependencies = _read_dep_file(dep_file)
+        except OSError:
+            dependencies = None
+        if dependencies and _BUILD_CACHE.store(slot.exec_path, cached_exec, dependencies):
+            return [cached_exec], None
+    return [slot.exec_path], None
+
+def _handle_java(file_path, slot, time_limit, optimize):
+    toolchain = get_toolchain()
+    java_exec = toolchain.java
+    if toolchain.javac is None or java_exec is None:
+        return None, ("Runtime Error", "Error: 'javac'/'java' command not found. Please ensure a JDK is installed and in your system's PATH.")
+    class_name = os.path.splitext(os.path.basename(file_path))[0]
+    cached_dir = _BUILD_CACHE.entry_path(file_path, toolchain.javac, class_name)
+    if cached_dir is not None and os.path.isdir(cached_dir):
+        _BUILD_CACHE.mark_used(cached_dir)
+        return [java_exec, "-cp", cached_dir, class_name], None
 
-    return os.path.join(code_folder_path, selected_file_name)
+    java_dir = slot.get_java_dir()
+    compile_process = _compile("java", file_path, java_dir, time_limit)
+    if compile_process.returncode != 0:
+        return None, ("Compilation Error", compile_process.stderr)
+    if cached_dir is not None and _BUILD_CACHE.store(java_dir, cached_dir):
+        return [java_exec, "-cp", cached_dir, class_name], None
+    return [java_exec, "-cp", java_dir, class_name], None
 
+_LANG_HANDLERS = {
+    "python": _handle_python,
+    "c": functools.partial(_handle_c_like, language="c"),
+    "cpp": functools.partial(_handle_c_like, language="cpp"),
+    "java": _handle_java
+}
 
-def run_code_from_file(file_path, time_limit=10, input_data=None):
-    results = {
+def _new_results():
+    return {
         "status": "Pending",
         "runtime": 0.0,
+        "runtime_str": "0.00",
         "output": "",
         "error": "",
         "language": "Unknown"
     }
 
-    if not os.path.exists(file_path):
+def _check_source(file_path, results):
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
         results["status"] = "File Error"
         results["error"] = f"Error: File not found at '{file_path}'."
-        return results
-
-    file_directory = os.path.dirname(os.path.abspath(file_path))
-    temp_files_dir = os.path.join(file_directory, "temp_files")
-
-    os.makedirs(temp_files_dir, exist_ok=True)
+        return file_path, None
 
+    if not os.path.isabs(file_path):
+        file_path = os.path.abspath(file_path)
     file_extension = os.path.splitext(file_path)[1].lower()
     language = SUPPORTED_EXTENSIONS.get(file_extension)
 
     if language is None:
         results["status"] = "Language Error"
         results["error"] = f"Error: Unsupported file extension '{file_extension}'. Supported: .py, .c, .cpp, .cxx, .cc, .java"
-        if os.path.exists(temp_files_dir) and not os.listdir(temp_files_dir):
-            os.rmdir(temp_files_dir)
-        return results
+        return file_path, None
 
     results["language"] = language
 
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code_content = f.read()
-    except Exception as e:
-        results["status"] = "File Error"
-        results["error"] = f"Error reading file: {e}"
-        if os.path.exists(temp_files_dir) and not os.listdir(temp_files_dir):
-            os.rmdir(temp_files_dir)
-        return results
+    is_blank = file_stat.st_size == 0
+    if not is_blank and file_stat.st_size < WHITESPACE_CHECK_LIMIT:
+        try:
+            with open(file_path, 'rb') as f:
+                is_blank = not f.read().strip()
+        except Exception as e:
+            results["status"] = "File Error"
+            results["error"] = f"Error reading file: {e}"
+            return file_path, None
 
-    if not code_content.strip():
+    if is_blank:
         results["status"] = "File Error"
         results["error"] = "Error: The provided file is empty or contains only whitespace."
-        if os.path.exists(temp_files_dir) and not os.listdir(temp_files_dir):
-            os.rmdir(temp_files_dir)
-        return results
+        return file_path, None
+
+    return file_path, language
+
+def _record_outcome(results, returncode, stdout, stderr, timed_out, elapsed, time_limit):
+    results["runtime"] = elapsed * 1000
+    results["runtime_str"] = f"{results['runtime']:.2f}"
+    results["output"] = stdout.decode('utf-8', errors='replace').strip()
+
+    if timed_out:
+        results["status"] = "Time Limit Exceeded"
+        results["error"] = f"Execution exceeded time limit of {time_limit} seconds."
+    else:
+        results["error"] = stderr.decode('utf-8', errors='replace').strip()
+        if returncode != 0:
+            results["status"] = "Runtime Error"
+            if not results["error"]:
+                results["error"] = f"Process exited with non-zero status code: {returncode}"
+        else:
+            results["status"] = "Success"
 
-    command = []
-    temp_exec_path = None
-    process = None
+def _record_launch_error(results, language, error):
+    if isinstance(error, FileNotFoundError):
+        results["status"] = "Runtime Error"
+        results["error"] = f"Error: Interpreter/compiler not found for {language}. Make sure it's in your PATH."
+    else:
+        results["status"] = "Internal Error"
+        results["error"] = f"An unexpected error occurred during execution: {error}"
+
+def _pump_output(pipe, tail, stream=None):
+    with pipe:
+        for chunk in iter(lambda: pipe.read1(STREAM_CHUNK_SIZE), b""):
+            if stream is not None:
+                stream.write(chunk)
+                stream.flush()
+            tail += chunk
+            if len(tail) > OUTPUT_TAIL_BYTES:
+                del tail[:len(tail) - OUTPUT_TAIL_BYTES]
 
+def _feed_input(pipe, input_data):
     try:
-        if language == "python":
-            command = ["python3", file_path]
-            try:
-                subprocess.run(["python3", "--version"], check=True, capture_output=True)
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                command = ["python", file_path]
-                try:
-                    subprocess.run(["python", "--version"], check=True, capture_output=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    results["status"] = "Runtime Error"
-                    results["error"] = "Error: Neither 'python3' nor 'python' command found. Please ensure Python is installed and in your system's PATH."
-                    return results
-
-        elif language == "c":
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".out", dir=temp_files_dir) as tmp_exec:
-                temp_exec_path = tmp_exec.name
-
-            compile_command = ["gcc", file_path, "-o", temp_exec_path]
-            compile_process = subprocess.run(
-                compile_command,
-                capture_output=True,
-                text=True,
-                timeout=time_limit
-            )
-            if compile_process.returncode != 0:
-                results["status"] = "Compilation Error"
-                results["error"] = compile_process.stderr
-                return results
-            command = [temp_exec_path]
-        elif language == "cpp":
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".out", dir=temp_files_dir) as tmp_exec:
-                temp_exec_path = tmp_exec.name
-
-            compile_command = ["g++", file_path, "-o", temp_exec_path]
-            compile_process = subprocess.run(
-                compile_command,
-                capture_output=True,
-                text=True,
-                timeout=time_limit
-            )
-            if compile_process.returncode != 0:
-                results["status"] = "Compilation Error"
-                results["error"] = compile_process.stderr
-                return results
-            command = [temp_exec_path]
-        elif language == "java":
-            class_name = os.path.splitext(os.path.basename(file_path))[0]
-            temp_dir = tempfile.mkdtemp(dir=temp_files_dir)
-            compile_command = ["javac", "-d", temp_dir, file_path]
-            compile_process = subprocess.run(
-                compile_command,
-                capture_output=True,
-                text=True,
-                timeout=time_limit
-            )
-            if compile_process.returncode != 0:
-                results["status"] = "Compilation Error"
-                results["error"] = compile_process.stderr
-                if os.path.exists(temp_dir):
-                    shutil.rmtree(temp_dir)
-                return results
-            command = ["java", "-cp", temp_dir, class_name]
-            temp_exec_path = temp_dir
+        with pipe:
+            pipe.write(input_data)
+    except BrokenPipeError:
+        pass
+
+def _input_source(input_data, stdin=None):
+    # Returns the stdin to spawn the program with, the input still left to write to it
+    # and the memfd created for it, if any, which the caller closes once spawned.
+    # Without input data the program gets stdin, by default the checker's own so it can
+    # be answered live.
+    if input_data is None:
+        return stdin, None, None
+    if len(input_data) < MEMFD_INPUT_THRESHOLD or not hasattr(os, "memfd_create"):
+        return subprocess.PIPE, input_data, None
+    try:
+        fd = os.memfd_create("runtime_checker_input", os.MFD_CLOEXEC)
+    except OSError:
+        return subprocess.PIPE, input_data, None
+    try:
+        view = memoryview(input_data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.lseek(fd, 0, os.SEEK_SET)
+    except OSError:
+        os.close(fd)
+        return subprocess.PIPE, input_data, None
+    return fd, None, fd
+
+def _communicate_streaming(process, input_data, time_limit, stream):
+    # Echo stdout to the stream as it arrives and keep only a bounded tail for the results
+    stdout_tail = bytearray()
+    stderr_tail = bytearray()
+    workers = [
+        threading.Thread(target=_pump_output, args=(process.stdout, stdout_tail, stream), daemon=True),
+        threading.Thread(target=_pump_output, args=(process.stderr, stderr_tail), daemon=True)
+    ]
+    if input_data is not None:
+        workers.append(threading.Thread(target=_feed_input, args=(process.stdin, input_data), daemon=True))
+    for worker in workers:
+        worker.start()
 
+    timed_out = False
+    try:
+        process.wait(timeout=time_limit)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        timed_out = True
+        process.wait()
+    for worker in workers:
+        worker.join()
+    return bytes(stdout_tail), bytes(stderr_tail), timed_out
 
-        start_time = time.perf_counter()
+def _execute(command, input_data, time_limit, results, language, stream=None, stdin=None):
+    stdin, input_data, memfd = _input_source(input_data, stdin)
+    start_time = time.perf_counter()
+    try:
         try:
-            process = subprocess.run(
+            process = subprocess.Popen(
                 command,
-                input=input_data,
-                capture_output=True,
-                text=True,
-                timeout=time_limit,
-                check=False
+                stdin=stdin,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                bufsize=-1
             )
-            end_time = time.perf_counter()
-            results["runtime"] = (end_time - start_time) * 1000
-            results["output"] = process.stdout.strip()
-            results["error"] = process.stderr.strip()
-
-            if process.returncode != 0:
-                results["status"] = "Runtime Error"
-                if not results["error"]:
-                    results["error"] = f"Process exited with non-zero status code: {process.returncode}"
-            else:
-                results["status"] = "Success"
+        finally:
+            if memfd is not None:
+                os.close(memfd)
+        if stream is None:
+            timed_out = False
+            try:
+                stdout, stderr = process.communicate(input=input_data, timeout=time_limit)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                timed_out = True
+                stdout, stderr = process.communicate()
+        else:
+            stdout, stderr, timed_out = _communicate_streaming(process, input_data, time_limit, stream)
+        elapsed = time.perf_counter() - start_time
+        _record_outcome(results, process.returncode, stdout, stderr, timed_out, elapsed, time_limit)
+    except Exception as e:
+        _record_launch_error(results, language, e)
+
+def run_code_from_file(file_path, time_limit=10, input_data=None, optimize=True, stream=None, stdin=None):
+    results = _new_results()
+    file_path, language = _check_source(file_path, results)
+    if language is None:
+        return results
 
+    handler = _LANG_HANDLERS[language]
+    try:
+        slot = _get_slot_pool().acquire() if language in _COMPILERS else None
+    except OSError as e:
+        results["status"] = "Internal Error"
+        results["error"] = f"Error: Could not create a temporary build directory: {e}"
+        return results
+
+    try:
+        try:
+            command, error = handler(file_path, slot, time_limit, optimize)
         except subprocess.TimeoutExpired:
-            if process and process.poll() is None:
-                process.kill()
-            end_time = time.perf_counter()
-            results["runtime"] = (end_time - start_time) * 1000
-            results["status"] = "Time Limit Exceeded"
-            results["error"] = f"Execution exceeded time limit of {time_limit} seconds."
-        except FileNotFoundError:
-            results["status"] = "Runtime Error"
-            results["error"] = f"Error: Interpreter/compiler not found for {language}. Make sure it's in your PATH."
+            command, error = None, ("Compilation Error", f"Compilation exceeded time limit of {time_limit} seconds.")
         except Exception as e:
-            results["status"] = "Internal Error"
-            results["error"] = f"An unexpected error occurred during execution: {e}"
+            _record_launch_error(results, language, e)
+            return results
+        if error is not None:
+            results["status"], results["error"] = error
+            return results
 
+        if isinstance(input_data, str):
+            input_data = input_data.encode('utf-8')
+        _execute(command, input_data, time_limit, results, language, stream, stdin)
     finally:
-        if language in ["c", "cpp"] and temp_exec_path and os.path.exists(temp_exec_path):
-            os.remove(temp_exec_path)
-        if language == "java" and temp_exec_path and os.path.exists(temp_exec_path):
-            shutil.rmtree(temp_exec_path, ignore_errors=True)
-
-        if os.path.exists(temp_files_dir) and not os.listdir(temp_files_dir):
-            os.rmdir(temp_files_dir)
+        if slot is not None:
+            _get_slot_pool().release(slot)
 
     return results
 
+def get_max_jobs():
+    try:
+        return max(1, int(os.environ.get(MAX_JOBS_ENV_VAR, DEFAULT_MAX_JOBS)))
+    except ValueError:
+        return DEFAULT_MAX_JOBS
+
+# Created on first use rather than at import: worker processes re-import this
+# module, and an import-time pool would make every worker spawn its own pool.
+_POOL = None
+
+def _init_pool_worker():
+    from multiprocessing.util import Finalize
+    # Workers leave through os._exit, so atexit never runs there. multiprocessing
+    # still runs its finalizers on the way out.
+    Finalize(None, _remove_session_temp_dir, exitpriority=0)
+    # Every worker would boot a JVM of its own, which only pays off once it has
+    # compiled a few Java files; a batch spreads them thinly, so workers use javac
+    _JAVA_COMPILE_SERVER.unavailable = True
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _POOL = ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, get_max_jobs()),
+            initializer=_init_pool_worker
+        )
+    return _POOL
+
+def submit_run(file_path, time_limit=10, input_data=None, optimize=True):
+    # Nobody is there to answer a program in a batch, and every worker shares the
+    # checker's stdin, so a program that reads input gets EOF rather than waiting
+    # out its time limit
+    return _get_pool().submit(run_code_from_file, file_path, time_limit, input_data, optimize, stdin=subprocess.DEVNULL)
+
+def print_run_header(file_name):
+    _OUT.print(f"\n--- Running '{file_name}' ---")
+    _OUT.flush()
+
+_RESULTS_SEPARATOR = "\n" + "=" * 50 + "\n"
+
+def print_results(results):
+    error_block = f"Error:\n{results['error']}\n" if results['error'] else ""
+    _OUT.print(
+        f"Status: {results['status']}\n"
+        f"Language: {results['language']}\n"
+        f"Runtime: {results['runtime_str']} MS\n"
+        f"Output:\n{results['output']}\n"
+        f"{error_block}{_RESULTS_SEPARATOR}"
+    )
+    _OUT.flush()
+
+def run_all(code_folder_path, time_limit=10):
+    code_files = list_code_files(code_folder_path)
+    if not code_files:
+        _OUT.print(f"Error: No supported code files found in '{code_folder_path}'.")
+        _OUT.flush()
+        return
+
+    if len(code_files) == 1:
+        # Starting worker processes costs more than it saves for a single file
+        [(file_name, file_path)] = code_files.items()
+        print_run_header(file_name)
+        print_results(run_code_from_file(file_path, time_limit, stdin=subprocess.DEVNULL))
+        return
+
+    from concurrent.futures import as_completed
+
+    futures = {
+        submit_run(file_path, time_limit): file_name
+        for file_name, file_path in code_files.items()
+    }
+    for future in as_completed(futures):
+        file_name = futures[future]
+        try:
+            results = future.result()
+        except Exception as e:
+            # A worker that died must not take the rest of the batch down with it
+            results = _new_results()
+            results["language"] = _classify_filename(file_name) or results["language"]
+            _record_launch_error(results, results["language"], e)
+        print_run_header(file_name)
+        print_results(results)
+
 # --- Main execution logic ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a code file and report how long it took to run.")
+    parser.add_argument("--all", action="store_true", help="run every supported file in the code folder in parallel, then exit")
+    args = parser.parse_args()
+
+    warm_up()
     code_folder = get_code_folder_path()
 
-    if code_folder:
+    if code_folder and args.all:
+        run_all(code_folder)
+    elif code_folder:
+        rerun = False
         while True:
-            selected_file_full_path = get_file_to_run(code_folder)
+            if not rerun:
+                selected_file_full_path = get_file_to_run(code_folder)
+                input_data = None
+
+                if selected_file_full_path:
+                    prefetch_file(selected_file_full_path)
+                    selected_file_name = os.path.basename(selected_file_full_path)
+                    if _classify_filename(selected_file_name) is not None:
+                        user_wants_input = _prompt("Does this code require input? (yes/no): ").strip()
+                        if user_wants_input in _YES:
+                            if sys.stdin.isatty():
+                                _OUT.print("Paste input data, then press Ctrl-D on a new line (Ctrl-Z then Enter on Windows):")
+                                _OUT.flush()
+                                # Nothing is read ahead on a terminal, so the raw bytes can be
+                                # handed to the program without a decode/encode round trip
+                                input_data = sys.stdin.buffer.read()
+                            else:
+                                input_data = sys.stdin.read()
+                            if not input_data.strip():
+                                input_data = None
 
             if selected_file_full_path:
-                file_extension = os.path.splitext(selected_file_full_path)[1].lower()
-                input_data = None
-                if file_extension in SUPPORTED_EXTENSIONS:
-                    user_wants_input = input("Does this code require input? (yes/no): ").strip().lower()
-                    if user_wants_input == 'yes':
-                        print("Enter input data. Type 'DONE' on a new line when finished:")
-                        input_lines = []
-                        while True:
-                            line = input()
-                            if line.strip().lower() == 'done':
-                                break
-                            input_lines.append(line)
-                        input_data = "\n".join(input_lines)
-                        if not input_data.strip():
-                            input_data = None
-
-                print(f"\n--- Running '{os.path.basename(selected_file_full_path)}' ---")
-                results = run_code_from_file(selected_file_full_path, input_data=input_data)
-                print(f"Status: {results['status']}")
-                print(f"Language: {results['language']}")
-                print(f"Runtime: {results['runtime']:.2f} MS")
-                print(f"Output:\n{results['output']}")
-                if results['error']:
-                    print(f"Error:\n{results['error']}")
-                print("\n" + "="*50 + "\n")
+                print_run_header(selected_file_name)
+                results = run_code_from_file(selected_file_full_path, input_data=input_data, stream=sys.stdout.buffer)
+                print_results(results)
             else:
-                print("No file selected or folder is empty. Cannot proceed with execution.")
+                _OUT.print("No file selected or folder is empty. Cannot proceed with execution.")
                 pass
 
             while True:
-                quit_choice = input("Do you want to quit? (yes/no): ").strip().lower()
-                if quit_choice == 'yes':
-                    print("Exiting..... Exited")
-                    exit()
-                elif quit_choice == 'no':
-                    print("\n--- Preparing for next code check ---")
+                try:
+                    next_choice = _read_choice("[r]e-run same file, [n]ew file, [q]uit: ")
+                except EOFError:
+                    next_choice = 'q'
+                action = _NEXT_ACTIONS.get(next_choice)
+                next_rerun = action(selected_file_full_path is not None) if action else None
+                if next_rerun is not None:
+                    rerun = next_rerun
                     break
-                else:
-                    print("Invalid choice. Please enter 'yes' or 'no'.")
+                _OUT.print("Invalid choice. Please enter 'r', 'n' or 'q'.")
     else:
-        print("Could not determine a valid code folder. Exiting.")
+        _OUT.print("Could not determine a valid code folder. Exiting.")